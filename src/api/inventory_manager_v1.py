@@ -1,13 +1,23 @@
 from typing_extensions import Annotated
-from fastapi import Depends, HTTPException, Query, APIRouter
-from src.config.dependency import get_mongo_db, get_settings, get_vector_store
+from fastapi import Body, Depends, HTTPException, Query, APIRouter
+from src.config.dependency import (
+    get_encoder,
+    get_pipeline,
+    get_sbert_model,
+    get_settings,
+    get_vector_store,
+)
+from src.models.sbert_model import SBERTModel
 
 from src.config.settings import Settings
-from src.database.mongodb_connector import MongoDBConnector
+from src.inference.gpu_worker import BatchEncoder
 from src.pipelines.ingestion_pipeline import IngestionPipeline
+from src.database.mongodb_connector import parse_id
 from src.database.vector_store import MongoDBVectorStore
 from src.config.logging import setup_logger
-from typing import List, Dict, Optional
+from typing import Dict, Optional
+from pydantic import Base64Bytes
+import numpy as np
 
 logger = setup_logger(__name__)
 
@@ -15,52 +25,70 @@ router = APIRouter()
 
 
 @router.post("/ingest")
-def ingest_data(
+async def ingest_data(
     settings: Annotated[Settings, Depends(get_settings)],
-    database: Annotated[MongoDBConnector, Depends(get_mongo_db)],
-    vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+    pipeline: Annotated[IngestionPipeline, Depends(get_pipeline)],
     page_size: int,
-    start_page: int,
-    end_page: int,
+    last_id: Optional[str] = None,
+    max_pages: Optional[int] = None,
 ):
     """
     Triggers the ingestion pipeline.
+
+    :param page_size: Number of documents per batch.
+    :param last_id: Resume after this document ID (returned by the previous run).
+    :param max_pages: Maximum number of batches to process.
     """
     try:
-        pipeline: IngestionPipeline = IngestionPipeline(
-            source_db=database, vector_store=vector_store
+        result = await pipeline.run(
+            settings.SOURCE_COLLECTION,
+            page_size,
+            last_id=parse_id(last_id) if last_id else None,
+            max_pages=max_pages,
         )
-        pipeline.run(settings.SOURCE_COLLECTION, page_size, start_page, end_page)
-        return {"message": "Ingestion pipeline completed successfully."}
+        return {
+            "message": "Ingestion pipeline completed successfully.",
+            "last_id": None if result["last_id"] is None else str(result["last_id"]),
+        }
     except Exception as e:
-        logger.error(f"Error in ingestion pipeline: {e}")
+        logger.error("Error in ingestion pipeline: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.put("/vectors/{vector_id}")
-def update_vector(
+async def update_vector(
     vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+    sbert_model: Annotated[SBERTModel, Depends(get_sbert_model)],
     vector_id: str,
     metadata: Dict,
-    embedding: Optional[List[float]] = None,
+    embedding: Annotated[Optional[Base64Bytes], Body()] = None,
 ):
     """
     Updates a vector document with new metadata and/or embedding.
 
     :param vector_id: The ID of the vector document to update.
     :param metadata: New metadata to update.
-    :param embedding: New embedding to update (optional).
+    :param embedding: New embedding as base64 little-endian float32 bytes (optional).
     """
+    # Vectors of any other size would be stored but left out of the index
+    if embedding is not None and len(embedding) != 4 * sbert_model.embedding_dimension:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Embedding must be {sbert_model.embedding_dimension} float32 values.",
+        )
+
     try:
-        vector_store.update_vector(vector_id, metadata, embedding)
+        if embedding is not None:
+            embedding = np.frombuffer(embedding, dtype="<f4")
+        await vector_store.update_vector(parse_id(vector_id), metadata, embedding)
         return {"message": "Vector updated successfully."}
     except Exception as e:
-        logger.error(f"Error updating vector: {e}")
+        logger.error("Error updating vector: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/vectors/{vector_id}")
-def delete_vector(
+async def delete_vector(
     vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
     vector_id: str,
 ):
@@ -70,16 +98,52 @@ def delete_vector(
     :param vector_id: The ID of the vector document to delete.
     """
     try:
-        vector_store.delete_vector(vector_id)
+        await vector_store.delete_vector(parse_id(vector_id))
         return {"message": "Vector deleted successfully."}
     except Exception as e:
-        logger.error(f"Error deleting vector: {e}")
+        logger.error("Error deleting vector: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/vectors/migrate")
+async def migrate_vectors(
+    settings: Annotated[Settings, Depends(get_settings)],
+    vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+):
+    """
+    Converts embeddings stored as arrays of doubles to packed BSON vectors.
+    """
+    try:
+        migrated = {
+            collection_name: await vector_store.migrate_embeddings(collection_name)
+            for collection_name in (settings.VECTOR_COLLECTION, settings.SOURCE_COLLECTION)
+        }
+        return {"message": "Vectors migrated successfully.", "migrated": migrated}
+    except Exception as e:
+        logger.error("Error migrating vectors: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/cache/clear")
+async def clear_caches(
+    encoder: Annotated[BatchEncoder, Depends(get_encoder)],
+    vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+):
+    """
+    Drops the memoized query embeddings and the cached search results.
+
+    Caches live in each worker process, so this only clears the process
+    that handles the request; with several workers, clear each one or
+    restart them.
+    """
+    encoder.clear_cache()
+    vector_store.clear_cache()
+    return {"message": "Caches cleared successfully."}
+
+
 @router.get("/usecase-recommendation")
-def usecase_recommendation(
-    database: Annotated[MongoDBConnector, Depends(get_mongo_db)],
+async def usecase_recommendation(
+    encoder: Annotated[BatchEncoder, Depends(get_encoder)],
     vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
     query: str,
     top_k: int = Query(default=5, ge=1, le=20),
@@ -92,17 +156,11 @@ def usecase_recommendation(
     """
     try:
         # Generate embedding for the query
-        pipeline: IngestionPipeline = IngestionPipeline(
-            source_db=database, vector_store=vector_store
-        )
-        embedding = pipeline.sbert_model.encode([query])[0]
+        embedding = await encoder.submit(query)
 
         # Search for similar vectors
-        results = vector_store.find_similar_vectors(embedding, top_k)
-        for res in results:
-            res["_id"] = str(res["_id"])
-        
+        results = await vector_store.find_similar_vectors(embedding, top_k)
         return {"results": results}
     except Exception as e:
-        logger.error(f"Error searching for similar vectors: {e}")
+        logger.error("Error searching for similar vectors: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
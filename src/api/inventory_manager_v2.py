@@ -1,14 +1,22 @@
 from typing_extensions import Annotated
 from fastapi import Depends, HTTPException, Query, APIRouter
-from src.config.dependency import get_mongo_db, get_settings, get_vector_store
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from src.config.dependency import (
+    get_encoder,
+    get_mongo_db,
+    get_pipeline,
+    get_settings,
+    get_vector_store,
+)
 
 from src.config.settings import Settings
-from src.database.mongodb_connector import MongoDBConnector
+from src.inference.gpu_worker import BatchEncoder
+from src.database.mongodb_connector import MongoDBConnector, parse_id
 from src.pipelines.ingestion_pipeline import IngestionPipeline
 from src.database.vector_store import MongoDBVectorStore
 from src.config.logging import setup_logger
 from typing import List, Dict
-from src.config.logging import setup_logger
 
 logger = setup_logger(__name__)
 
@@ -16,37 +24,29 @@ router = APIRouter()
 
 
 @router.post("/vectors/embeddings")
-def get_vector_embedding(
-    settings: Annotated[Settings, Depends(get_settings)],
-    database: Annotated[MongoDBConnector, Depends(get_mongo_db)],
-    vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+async def get_vector_embedding(
+    pipeline: Annotated[IngestionPipeline, Depends(get_pipeline)],
     models_metadata: List[Dict],
 ):
     """
     Updates a vector document with new metadata and/or embedding.
     """
     try:
-        pipeline: IngestionPipeline = IngestionPipeline(
-            source_db=database, vector_store=vector_store
-        )
-
-        embeddings = []
-        for model_metadata in models_metadata:
-            embedding = pipeline.get_embedding(model_metadata)
-            embeddings.append(embedding[0])
-
-        return embeddings
+        embeddings = await run_in_threadpool(pipeline.get_embeddings, models_metadata)
+        # Returned as a response so orjson serializes the ndarray directly
+        return ORJSONResponse(embeddings)
 
     except Exception as e:
-        logger.error(f"Error updating vector: {e}")
+        logger.error("Error updating vector: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.put("/vectors/update")
-def update_vector(
+async def update_vector(
     settings: Annotated[Settings, Depends(get_settings)],
     database: Annotated[MongoDBConnector, Depends(get_mongo_db)],
     vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+    pipeline: Annotated[IngestionPipeline, Depends(get_pipeline)],
     vector_ids: List[str],
 ):
     """
@@ -55,32 +55,35 @@ def update_vector(
     :param vector_ids: The IDs of the vector document to update.
     """
     try:
-        pipeline: IngestionPipeline = IngestionPipeline(
-            source_db=database, vector_store=vector_store
+        # Match both forms so string and ObjectId keys hit the _id index
+        ids = vector_ids + [parse_id(vector_id) for vector_id in vector_ids]
+        models_metadata = await database.get_models(
+            settings.SOURCE_COLLECTION, {"_id": {"$in": ids}}
         )
 
-        for vector_id in vector_ids:
-            model_metadata = database.get_model(
-                settings.SOURCE_COLLECTION, {"_id": vector_id}
-            )
-
-            embedding = pipeline.get_embedding(model_metadata)
-            model_metadata["embedding"] = embedding
+        # Ids are taken from the fetched documents so that missing ones are skipped
+        model_ids = [model_metadata["_id"] for model_metadata in models_metadata]
+        embeddings = await run_in_threadpool(pipeline.get_embeddings, models_metadata)
 
-            database.update_vector(
-                settings.SOURCE_COLLECTION, vector_id, model_metadata
-            )
+        # Packed by the store so /search sees the configured quantization
+        fields = await vector_store.pack_embeddings(
+            embeddings, settings.SOURCE_COLLECTION
+        )
+        await database.update_vectors(
+            settings.SOURCE_COLLECTION, dict(zip(model_ids, fields))
+        )
+        vector_store.clear_cache()
 
         return {"message": "documents updated successfully."}
     except Exception as e:
-        logger.error(f"Error updating vector: {e}")
+        logger.error("Error updating vector: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/usecase-recommendation")
-def usecase_recommendation(
+async def usecase_recommendation(
     settings: Annotated[Settings, Depends(get_settings)],
-    database: Annotated[MongoDBConnector, Depends(get_mongo_db)],
+    encoder: Annotated[BatchEncoder, Depends(get_encoder)],
     vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
     query: str,
     top_k: int = Query(default=5, ge=1, le=20),
@@ -93,16 +96,13 @@ def usecase_recommendation(
     """
     try:
         # Generate embedding for the query
-        pipeline: IngestionPipeline = IngestionPipeline(
-            source_db=database, vector_store=vector_store
-        )
-        embedding = pipeline.sbert_model.encode([query])[0]
+        embedding = await encoder.submit(query)
 
         # Search for similar vectors
-        results = vector_store.find_similar_vectors(
+        results = await vector_store.find_similar_vectors(
             embedding, top_k, settings.SOURCE_COLLECTION
         )
         return {"results": results}
     except Exception as e:
-        logger.error(f"Error searching for similar vectors: {e}")
+        logger.error("Error searching for similar vectors: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
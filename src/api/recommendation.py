@@ -1,44 +1,127 @@
 from typing_extensions import Annotated
-from fastapi import Depends, HTTPException, Query, APIRouter
-from src.config.dependency import get_mongo_db, get_settings, get_vector_store
+from fastapi import Body, Depends, HTTPException, Query, APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from src.config.dependency import (
+    get_encoder,
+    get_sbert_model,
+    get_settings,
+    get_vector_store,
+)
 
 from src.config.settings import Settings
-from src.database.mongodb_connector import MongoDBConnector
-from src.pipelines.ingestion_pipeline import IngestionPipeline
+from src.inference.gpu_worker import BatchEncoder
+from src.models.sbert_model import SBERTModel
 from src.database.vector_store import MongoDBVectorStore
 from src.config.logging import setup_logger
+from typing import List
+import orjson
 
 logger = setup_logger(__name__)
 
 router = APIRouter()
 
+# Each query is a $unionWith branch and a row of one forward pass
+MAX_BATCH_QUERIES = 64
+
 
 @router.get("/search")
-def search_similar_vectors(
+async def search_similar_vectors(
     settings: Annotated[Settings, Depends(get_settings)],
-    database: Annotated[MongoDBConnector, Depends(get_mongo_db)],
+    encoder: Annotated[BatchEncoder, Depends(get_encoder)],
     vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
     query: str,
     top_k: int = Query(default=5, ge=1, le=20),
+    include_embedding: bool = False,
 ):
     """
     Searches for similar vectors in the vector store.
 
     :param query: The query text.
     :param top_k: Number of similar vectors to return.
+    :param include_embedding: Also return each result's embedding.
     """
     try:
         # Generate embedding for the query
-        pipeline: IngestionPipeline = IngestionPipeline(
-            source_db=database, vector_store=vector_store
-        )
-        embedding = pipeline.sbert_model.encode([query])[0]
+        embedding = await encoder.submit(query)
 
         # Search for similar vectors
-        results = vector_store.find_similar_vectors(
-            embedding, top_k, collection_name=settings.SOURCE_COLLECTION
+        results = await vector_store.find_similar_vectors(
+            embedding,
+            top_k,
+            collection_name=settings.SOURCE_COLLECTION,
+            include_embedding=include_embedding,
+        )
+        # Returned as a response so orjson serializes the embedding arrays directly
+        return ORJSONResponse({"results": results})
+    except Exception as e:
+        logger.error("Error searching for similar vectors: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search/stream")
+async def stream_similar_vectors(
+    settings: Annotated[Settings, Depends(get_settings)],
+    encoder: Annotated[BatchEncoder, Depends(get_encoder)],
+    vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+    query: str,
+    top_k: int = Query(default=5, ge=1, le=20),
+):
+    """
+    Streams similar vectors as newline-delimited JSON, one result per line.
+
+    :param query: The query text.
+    :param top_k: Number of similar vectors to return.
+    """
+    try:
+        # Generate embedding for the query
+        embedding = await encoder.submit(query)
+    except Exception as e:
+        logger.error("Error searching for similar vectors: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def generate():
+        try:
+            async for document in vector_store.stream_similar_vectors(
+                embedding, top_k, collection_name=settings.SOURCE_COLLECTION
+            ):
+                yield orjson.dumps(
+                    document, default=str, option=orjson.OPT_SERIALIZE_NUMPY
+                ) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so the error can only end the stream
+            logger.error("Error streaming similar vectors: %s", e)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.post("/search/batch")
+async def search_similar_vectors_batch(
+    settings: Annotated[Settings, Depends(get_settings)],
+    sbert_model: Annotated[SBERTModel, Depends(get_sbert_model)],
+    vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+    queries: Annotated[List[str], Body(min_length=1, max_length=MAX_BATCH_QUERIES)],
+    top_k: int = Query(default=5, ge=1, le=20),
+):
+    """
+    Searches for similar vectors for several queries at once.
+
+    :param queries: The query texts.
+    :param top_k: Number of similar vectors to return per query.
+    """
+    try:
+        # Generate embeddings for all queries in one forward pass
+        embeddings = await run_in_threadpool(sbert_model.encode, queries)
+
+        # Search for similar vectors in a single aggregation
+        matches = await vector_store.find_similar_vectors_batch(
+            embeddings, top_k, collection_name=settings.SOURCE_COLLECTION
         )
+        results = [
+            {"query": query, "results": match}
+            for query, match in zip(queries, matches)
+        ]
         return {"results": results}
     except Exception as e:
-        logger.error(f"Error searching for similar vectors: {e}")
+        logger.error("Error searching for similar vectors: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
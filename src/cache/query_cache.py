@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+
+# Longer queries are rare and would let a few requests pin a lot of memory
+MAX_CACHED_QUERY_LENGTH = 512
+
+
+class QueryCache:
+    def __init__(self, capacity: int = 4096):
+        """
+        Fixed-capacity LRU cache of query embeddings keyed on the exact text.
+
+        Not thread-safe: it is meant to be used from the event loop only.
+        Cached embeddings are read-only, so callers cannot corrupt them.
+
+        :param capacity: Maximum number of cached embeddings.
+        """
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Returns the embedding cached for a text.
+
+        :param text: The query text.
+        :return: The cached embedding, or None on a miss.
+        """
+        embedding = self._entries.get(text)
+        if embedding is not None:
+            self._entries.move_to_end(text)
+        return embedding
+
+    def put(self, text: str, embedding: np.ndarray) -> np.ndarray:
+        """
+        Caches the embedding of a text, evicting the least recently used entry.
+
+        :param text: The query text.
+        :param embedding: Its embedding.
+        :return: The embedding as stored (a read-only float32 array).
+        """
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+        if self.capacity <= 0 or len(text) > MAX_CACHED_QUERY_LENGTH:
+            return embedding
+
+        self._entries[text] = embedding
+        self._entries.move_to_end(text)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return embedding
+
+    def clear(self):
+        """
+        Drops every cached embedding.
+        """
+        self._entries.clear()
@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from src.utils.embeddings import normalize
+
+Vector = Union[Sequence[float], np.ndarray]
+
+
+class SimLRU:
+    def __init__(self, capacity: int = 1024, epsilon: float = 0.02):
+        """
+        Fixed-capacity LRU cache keyed on embeddings rather than exact inputs.
+
+        A lookup hits when a cached embedding has cosine similarity of at least
+        1 - epsilon with the query embedding. Cached embeddings live in one
+        preallocated (capacity, d) float32 matrix, so a lookup is a single
+        matrix-vector product and eviction overwrites a row in place.
+
+        :param capacity: Maximum number of cached entries.
+        :param epsilon: Maximum cosine distance that still counts as a hit.
+        """
+        self.capacity = capacity
+        self.epsilon = epsilon
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _touch(self, row: int):
+        self._clock += 1
+        self._last_used[row] = self._clock
+
+    def get(self, embedding: Vector) -> Optional[Any]:
+        """
+        Returns the value cached for the closest embedding, if close enough.
+
+        :param embedding: The query embedding.
+        :return: The cached value, or None on a miss.
+        """
+        if not self._size:
+            return None
+
+        vector = normalize(embedding).ravel()
+        row = self._rows.get(vector.tobytes())
+        if row is None:
+            scores = self._matrix[: self._size] @ vector
+            row = int(scores.argmax())
+            if scores[row] < 1 - self.epsilon:
+                return None
+
+        self._touch(row)
+        return self._values[row]
+
+    def put(self, embedding: Vector, value: Any):
+        """
+        Caches a value for an embedding, evicting the least recently used entry.
+
+        :param embedding: The query embedding.
+        :param value: The value to cache.
+        """
+        if self.capacity <= 0:
+            return
+
+        vector = normalize(embedding).ravel()
+        key = vector.tobytes()
+        row = self._rows.get(key)
+        if row is None:
+            if self._matrix is None:
+                self._matrix = np.empty((self.capacity, vector.shape[0]), np.float32)
+
+            if self._size < self.capacity:
+                row = self._size
+                self._size += 1
+                self._keys.append(key)
+                self._values.append(None)
+            else:
+                row = int(self._last_used.argmin())
+                del self._rows[self._keys[row]]
+                self._keys[row] = key
+
+            self._matrix[row] = vector
+            self._rows[key] = row
+
+        self._values[row] = value
+        self._touch(row)
+
+    def clear(self):
+        """
+        Drops every cached entry.
+        """
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[bytes] = []
+        self._values: List[Any] = []
+        self._rows: Dict[bytes, int] = {}
+        self._last_used = np.zeros(max(self.capacity, 0), dtype=np.int64)
+        self._clock = 0
+        self._size = 0
@@ -1,9 +1,12 @@
 from functools import lru_cache
 from typing_extensions import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
 from src.config.settings import Settings
 from src.database.mongodb_connector import MongoDBConnector
 from src.database.vector_store import MongoDBVectorStore
+from src.inference.gpu_worker import BatchEncoder
+from src.models.sbert_model import SBERTModel
+from src.pipelines.ingestion_pipeline import IngestionPipeline
 
 
 @lru_cache(maxsize=None, typed=False)
@@ -27,5 +30,38 @@ def get_vector_store(
     return MongoDBVectorStore(
         settings.PASSWORD,
         settings.DATABASE_NAME,
-        settings.VECTOR_COLLECTION
+        settings.VECTOR_COLLECTION,
+        cache_size=settings.SIMILARITY_CACHE_SIZE,
+        cache_epsilon=settings.SIMILARITY_CACHE_EPSILON,
+        quantization=settings.VECTOR_QUANTIZATION,
     )
+
+
+@lru_cache(maxsize=None, typed=False)
+def get_sbert_model(
+    settings: Annotated[Settings, Depends(get_settings)]
+) -> SBERTModel:
+    # The only model provider: the lifespan in src/main.py loads and warms it
+    if settings.SBERT_BACKEND == "onnx":
+        # Imported lazily: onnxruntime and optimum are optional dependencies
+        from src.models.onnx_sbert_model import ONNXSBERTModel
+
+        return ONNXSBERTModel(projection_path=settings.SBERT_PROJECTION_PATH)
+    return SBERTModel(projection_path=settings.SBERT_PROJECTION_PATH)
+
+
+@lru_cache(maxsize=None, typed=False)
+def get_pipeline(
+    database: Annotated[MongoDBConnector, Depends(get_mongo_db)],
+    vector_store: Annotated[MongoDBVectorStore, Depends(get_vector_store)],
+    sbert_model: Annotated[SBERTModel, Depends(get_sbert_model)],
+) -> IngestionPipeline:
+    # Build the pipeline (and load the SBERT model) once per process
+    return IngestionPipeline(
+        source_db=database, vector_store=vector_store, sbert_model=sbert_model
+    )
+
+
+def get_encoder(request: Request) -> BatchEncoder:
+    # Started by the application lifespan in src/main.py
+    return request.app.state.encoder
@@ -1,5 +1,38 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict
+
+# One queue (drained by a background listener) per log file
+_queues: Dict[str, queue.Queue] = {}
+
+
+def _get_log_queue(log_file, max_bytes, backup_count) -> queue.Queue:
+    """
+    Return the queue feeding the listener for a log file, starting it if needed.
+    """
+    if log_file not in _queues:
+        # Create a formatter
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+
+        # Create a rotating file handler
+        handler = RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count
+        )
+        handler.setFormatter(formatter)
+
+        # Format and write records on a background thread
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        _queues[log_file] = log_queue
+
+    return _queues[log_file]
 
 
 def setup_logger(
@@ -12,6 +45,10 @@ def setup_logger(
     """
     Set up a logger with file rotation.
 
+    Safe to call repeatedly: a logger that already has handlers is returned
+    as is. Records are handed to a queue and written to the rotating file on
+    a background thread, so logging never blocks on disk I/O.
+
     :param name: Name of the logger (usually __name__).
     :param debug_level: Logging level (e.g., logging.DEBUG, logging.INFO). Default is logging.INFO.
     :param log_file: Path to the log file. Default is 'app.log'.
@@ -23,18 +60,12 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(debug_level)
 
-    # Create a formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-
-    # Create a rotating file handler
-    handler = RotatingFileHandler(
-        log_file, maxBytes=max_bytes, backupCount=backup_count
-    )
-    handler.setFormatter(formatter)
+    if logger.handlers:
+        return logger
 
     # Add the handler to the logger
-    logger.addHandler(handler)
+    logger.addHandler(
+        QueueHandler(_get_log_queue(log_file, max_bytes, backup_count))
+    )
 
     return logger
@@ -1,3 +1,4 @@
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +10,20 @@ class Settings(BaseSettings):
     SOURCE_COLLECTION: str
     VECTOR_COLLECTION: str
 
+    # Sentence encoder backend: "torch" or "onnx" (int8 ONNX Runtime on CPU)
+    SBERT_BACKEND: Literal["torch", "onnx"] = "torch"
+    # Optional .npy (target, source) projection applied to every embedding
+    SBERT_PROJECTION_PATH: Optional[str] = None
+
+    # Similarity cache in front of vector search
+    SIMILARITY_CACHE_SIZE: int = 1024
+    SIMILARITY_CACHE_EPSILON: float = 0.02
+
+    # Embedding storage in the vector and source collections: "none" (float32),
+    # "int8", or "binary" (int8 plus sign bits for Hamming search with int8
+    # rescoring); re-ingest and re-run /vectors/update after changing
+    VECTOR_QUANTIZATION: Literal["none", "int8", "binary"] = "none"
+
     class Config:
         frozen = True
         env_file = ".env"
@@ -0,0 +1,14 @@
+from functools import lru_cache
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.server_api import ServerApi
+
+
+@lru_cache(maxsize=8)
+def get_client(uri: str) -> AsyncIOMotorClient:
+    """
+    Returns the process-wide client for a connection URI.
+
+    A client is already a connection pool, so every connector sharing a URI
+    shares one set of sockets and monitor threads.
+    """
+    return AsyncIOMotorClient(uri, server_api=ServerApi("1"), maxPoolSize=100)
@@ -0,0 +1,139 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple
+import numpy as np
+from src.cache.query_cache import QueryCache
+from src.config.logging import setup_logger
+
+if TYPE_CHECKING:
+    # Only needed for annotations; importing it loads torch
+    from src.models.sbert_model import SBERTModel
+
+logger = setup_logger(__name__)
+
+
+class BatchEncoder:
+    def __init__(
+        self,
+        model: "SBERTModel",
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+        cache_size: int = 4096,
+    ):
+        """
+        Coalesces concurrent single-text encode requests into batched forward passes.
+
+        Requests are queued; a background task waits up to max_wait seconds
+        for more to arrive, encodes them in one call (on the GPU when
+        SentenceTransformer found one) and resolves each caller's future.
+        Recent texts are memoized, so only texts missing from the cache are
+        encoded.
+
+        :param model: The encoder shared by all requests.
+        :param max_batch_size: Maximum number of texts per forward pass.
+        :param max_wait: Seconds to wait for a batch to fill after the first request.
+        :param cache_size: Maximum number of memoized query embeddings.
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.cache = QueryCache(cache_size)
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._batch_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, text: str) -> np.ndarray:
+        """
+        Encodes one text as part of the next batch.
+
+        :param text: The text to encode.
+        :return: Its embedding.
+        """
+        embedding = self.cache.get(text)
+        if embedding is not None:
+            return embedding
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def clear_cache(self):
+        """
+        Drops every memoized query embedding held by this encoder.
+        """
+        self.cache.clear()
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Texts may have been cached, or repeated, since they were queued
+            embeddings = {}
+            for text, _ in batch:
+                if text not in embeddings:
+                    embeddings[text] = self.cache.get(text)
+            misses = [text for text, embedding in embeddings.items() if embedding is None]
+            try:
+                if len(misses) == 1:
+                    encoded = [
+                        await loop.run_in_executor(None, self.model.encode_one, misses[0])
+                    ]
+                elif misses:
+                    encoded = await loop.run_in_executor(
+                        None, self.model.encode, misses, len(misses)
+                    )
+                else:
+                    encoded = []
+            except Exception as e:
+                logger.error("Error encoding batch of %s texts: %s", len(misses), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for text, embedding in zip(misses, encoded):
+                embeddings[text] = self.cache.put(text, embedding)
+
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(embeddings[text])
+
+
+@asynccontextmanager
+async def batch_encoder(
+    model: "SBERTModel", max_batch_size: int = 64, max_wait: float = 0.005
+) -> AsyncIterator[BatchEncoder]:
+    """
+    Runs a BatchEncoder for the lifetime of the context.
+    """
+    encoder = BatchEncoder(model, max_batch_size=max_batch_size, max_wait=max_wait)
+    encoder.start()
+    try:
+        yield encoder
+    finally:
+        await encoder.stop()
@@ -1,12 +1,72 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from src.api import inventory_manager_v1, inventory_manager_v2, recommendation
 from src.config import settings
+from src.config.dependency import (
+    get_mongo_db,
+    get_pipeline,
+    get_sbert_model,
+    get_settings,
+    get_vector_store,
+)
+from src.config.logging import setup_logger
+from src.inference.gpu_worker import batch_encoder
+
+logger = setup_logger(__name__)
 
 # Initialize settings
 settings = settings.Settings()
 
-app = FastAPI(title="Application Management API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # FastAPI calls dependencies with keyword arguments, and lru_cache keys
+    # f(x) and f(settings=x) apart, so warm the caches the same way; positional
+    # calls would leave requests to build a second pipeline and SBERT model.
+    settings = get_settings()
+    sbert_model = get_sbert_model(settings=settings)
+    vector_store = get_vector_store(settings=settings)
+
+    # Warm the cached pipeline so the first request doesn't pay for the SBERT load
+    get_pipeline(
+        database=get_mongo_db(settings=settings),
+        vector_store=vector_store,
+        sbert_model=sbert_model,
+    )
+
+    # One throwaway encode pays for lazy kernel and CUDA initialization up front
+    await run_in_threadpool(sbert_model.encode, ["warmup"])
+
+    # Both the vector collection and the embedded source collection are searched.
+    # Index management is Atlas-only and needs extra privileges, so a failure
+    # is logged rather than keeping the API from starting.
+    for collection_name in (settings.VECTOR_COLLECTION, settings.SOURCE_COLLECTION):
+        try:
+            await vector_store.ensure_vector_index(
+                sbert_model.embedding_dimension, collection_name
+            )
+        except Exception as e:
+            logger.warning(
+                "Vector index on %s not ensured, searches may fail: %s",
+                collection_name,
+                e,
+            )
+
+    # Query encodes from concurrent requests are batched by a background task
+    async with batch_encoder(sbert_model) as encoder:
+        app.state.encoder = encoder
+        yield
+
+
+app = FastAPI(
+    title="Application Management API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Configure CORS
 app.add_middleware(
@@ -24,3 +84,4 @@ app.include_router(
     inventory_manager_v2.router, prefix="/api/inventory_manager_v2", tags=["inventory_manager_v2"]
 )
 app.include_router(recommendation.router, prefix="/api", tags=["recommendation"])
+
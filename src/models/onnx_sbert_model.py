@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import onnxruntime as ort
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from optimum.exporters.onnx import main_export
+from transformers import AutoTokenizer
+from src.config.logging import setup_logger
+from src.models.sbert_model import SBERTModel
+from src.utils.embeddings import normalize
+
+logger = setup_logger(__name__)
+
+# Longer inputs are truncated: MiniLM was trained on sequences up to 128 tokens
+MAX_SEQUENCE_LENGTH = 128
+
+
+class ONNXSBERTModel(SBERTModel):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: str = "onnx_models",
+        projection_path: Optional[str] = None,
+    ):
+        """
+        SBERT served by ONNX Runtime on CPU with int8 dynamic quantization.
+
+        The model is exported and quantized on first use and loaded from
+        cache_dir afterwards.
+
+        :param model_name: Sentence-Transformers model name.
+        :param cache_dir: Directory holding the exported ONNX models.
+        :param projection_path: Optional .npy file holding a (target, source)
+            projection fit offline, e.g. PCA components.
+        """
+        export_dir = Path(cache_dir) / model_name
+        model_path = export_dir / "model_quantized.onnx"
+        if not model_path.exists():
+            self._export(f"sentence-transformers/{model_name}", export_dir, model_path)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir, use_fast=True)
+
+        sess_options = ort.SessionOptions()
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess_options.intra_op_num_threads = os.cpu_count() or 0
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        # Hidden size of the token embeddings that are mean-pooled
+        self.sentence_embedding_dimension = self.session.get_outputs()[0].shape[-1]
+        self.projection = self._load_projection(projection_path)
+
+    @staticmethod
+    def _export(model_id: str, export_dir: Path, model_path: Path):
+        logger.info("Exporting %s to ONNX in %s", model_id, export_dir)
+        main_export(model_id, output=export_dir, task="feature-extraction")
+        quantize_dynamic(
+            export_dir / "model.onnx", model_path, weight_type=QuantType.QInt8
+        )
+        os.remove(export_dir / "model.onnx")
+
+    def embed_one(self, text: str) -> np.ndarray:
+        # No padding is needed for one text, so the batched path costs nothing extra
+        return self.embed([text])[0]
+
+    def embed(self, texts: list, batch_size: int = 1024) -> np.ndarray:
+        """
+        Tokenizes, runs the ONNX graph, then mean-pools and L2-normalizes.
+        """
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQUENCE_LENGTH,
+                return_tensors="np",
+            )
+            feeds = {
+                name: value for name, value in inputs.items() if name in self.input_names
+            }
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real (non-padding) tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            batches.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        return normalize(np.concatenate(batches))
@@ -1,31 +1,95 @@
+from typing import Optional
 from sentence_transformers import SentenceTransformer
+import numpy as np
 import torch
-import torch.nn as nn
+from src.utils.embeddings import normalize
+
+
+def _cpu_supports_bf16() -> bool:
+    # Private helper that only exists on recent torch releases
+    is_supported = getattr(torch.cpu, "_is_avx512_bf16_supported", None)
+    return bool(is_supported and is_supported())
 
 
 class SBERTModel:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self, model_name: str = "all-MiniLM-L6-v2", projection_path: Optional[str] = None
+    ):
+        """
+        Sentence-Transformers encoder producing unit-length float32 embeddings.
+
+        :param model_name: Sentence-Transformers model name.
+        :param projection_path: Optional .npy file holding a (target, source)
+            projection fit offline, e.g. PCA components.
+        """
         self.model = SentenceTransformer(model_name)
+        # Half precision halves weight and activation traffic; outputs are
+        # cast back to float32 before projection
+        if self.model.device.type == "cuda":
+            self.model.half()
+        elif _cpu_supports_bf16():
+            self.model.to(dtype=torch.bfloat16)
+        self.sentence_embedding_dimension = self.model.get_sentence_embedding_dimension()
+        self.projection = self._load_projection(projection_path)
+
+    @staticmethod
+    def _load_projection(projection_path: Optional[str]) -> Optional[np.ndarray]:
+        if projection_path is None:
+            return None
+        return np.load(projection_path).astype(np.float32)
+
+    @property
+    def embedding_dimension(self) -> int:
+        if self.projection is not None:
+            return self.projection.shape[0]
+        return self.sentence_embedding_dimension
 
-    def encode(self, texts: list) -> list:
-        embeddings = self.model.encode(texts, show_progress_bar=True).tolist()
-        return self.project_embeddings(embeddings)
-    
-    def project_embeddings(self, embedding):
-        # Original embedding size (e.g., 384 for all-MiniLM-L6-v2)
-        original_embedding_size = 384
-        target_embedding_size = 1024
+    def encode(self, texts: list, batch_size: int = 1024) -> np.ndarray:
+        """
+        Encodes texts into unit-length float32 embeddings, one row per text.
 
-        # Projection layer
-        projection_layer = nn.Linear(original_embedding_size, target_embedding_size)
+        Vectors are normalized so that dot product equals cosine similarity.
+        """
+        embeddings = self.embed(texts, batch_size=batch_size)
+        if self.projection is not None:
+            # The projection does not preserve length, so normalize its output too
+            embeddings = normalize(embeddings @ self.projection.T)
+        return embeddings
 
-        # Example embedding (from SBERT)
-        embedding = torch.randn(1, original_embedding_size)  # Simulated embedding
+    def encode_one(self, text: str) -> np.ndarray:
+        """
+        Encodes a single text into a unit-length float32 embedding.
+        """
+        embedding = self.embed_one(text)
+        if self.projection is not None:
+            embedding = normalize(self.projection @ embedding)
+        return embedding
 
-        # Project to 1024 dimensions
-        expanded_embedding = projection_layer(embedding)  # Shape: (1, 1024)
+    def embed_one(self, text: str) -> np.ndarray:
+        """
+        Runs the sentence encoder on one text, skipping batching and sorting.
+        """
+        with torch.inference_mode():
+            embedding = self.model.encode(
+                text,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+        return embedding.astype(np.float32, copy=False)
 
-        # Convert to Python list
-        expanded_embedding_list = expanded_embedding.detach().numpy().tolist()
-        return expanded_embedding_list
-    
+    def embed(self, texts: list, batch_size: int = 1024) -> np.ndarray:
+        """
+        Runs the sentence encoder itself, returning unit-length embeddings.
+        """
+        # One call over the whole list lets SentenceTransformer length-sort it
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                texts,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                convert_to_tensor=False,
+                normalize_embeddings=True,
+            )
+        return embeddings.astype(np.float32, copy=False)
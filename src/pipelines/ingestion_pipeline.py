@@ -1,42 +1,67 @@
 from src.database.mongodb_connector import MongoDBConnector
 from src.database.vector_store import MongoDBVectorStore
 from src.models.sbert_model import SBERTModel
-from src.utils.data_processor import models_to_text
+from src.utils.data_processor import models_to_text, models_to_texts
 from src.config.logging import setup_logger
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional
+import asyncio
+import logging
 import math
+import multiprocessing
+import os
+import numpy as np
 
 logger = setup_logger(__name__)
 
+# Pages smaller than this are not worth the pickling round-trip to worker processes
+MIN_PARALLEL_DOCUMENTS = 256
+
+_text_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_text_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool that builds texts, starting it on first use.
+    """
+    global _text_pool
+    if _text_pool is None:
+        # Spawned rather than forked: the parent runs logging and driver threads
+        _text_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _text_pool
+
 
 class IngestionPipeline:
     def __init__(
         self,
         source_db: MongoDBConnector,
         vector_store: MongoDBVectorStore,
+        sbert_model: Optional[SBERTModel] = None,
     ):
         """
         Initializes the batch ingestion pipeline.
 
         Args:
-            password: MongoDB password
-            database_name: Name of the database
-            source_collection: Name of the source collection
-            vector_collection: Name of the vector collection
+            source_db: Connector for the source database
+            vector_store: Vector store the embeddings are written to
+            sbert_model: Optional encoder to use (defaults to SBERTModel)
         """
         self.source_db = source_db
         self.vector_store = vector_store
-        self.sbert_model = SBERTModel()
+        self.sbert_model = sbert_model or SBERTModel()
 
-    def _single_process(self, data: dict):
+    def _embed_documents(self, data: List[dict]):
         """
-        Process a single data.
+        Embed a list of documents in a single encode call.
 
         Args:
             data: List of documents to process
         """
         # Process the batch
-        processed_data = models_to_text([data])
+        processed_data = models_to_text(data)
 
         # Generate embeddings
         texts = [item["content"] for item in processed_data]
@@ -44,118 +69,220 @@ class IngestionPipeline:
 
         return embeddings
 
-    def _process_batch(self, batch_data):
+    async def _build_texts(self, batch_data: List[dict]) -> List[str]:
         """
-        Process a single batch of data.
+        Build the texts to embed, sharding large pages across processes.
 
         Args:
             batch_data: List of documents to process
+
+        Returns:
+            One text per document, in page order
         """
-        # Process the batch
-        processed_data = models_to_text(batch_data)
+        loop = asyncio.get_running_loop()
+        workers = os.cpu_count() or 1
+        if workers == 1 or len(batch_data) < MIN_PARALLEL_DOCUMENTS:
+            return await loop.run_in_executor(None, models_to_texts, batch_data)
+
+        # The string work holds the GIL, so threads would not run it in parallel
+        chunk_size = math.ceil(len(batch_data) / workers)
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    _get_text_pool(), models_to_texts, batch_data[start : start + chunk_size]
+                )
+                for start in range(0, len(batch_data), chunk_size)
+            )
+        )
+        return [text for chunk in chunks for text in chunk]
+
+    async def _embed_batch(self, batch_data) -> List[dict]:
+        """
+        Build texts for a batch of documents and embed them.
+
+        Args:
+            batch_data: List of documents to process
+
+        Returns:
+            List of vector documents ready for the vector store
+        """
+        # Text building and encoding are CPU-bound: keep both off the event loop
+        loop = asyncio.get_running_loop()
+        texts = await self._build_texts(batch_data)
 
         # # Generate embeddings
-        model_ids = [item["_id"] for item in processed_data]
-        texts = [item["content"] for item in processed_data]
-        names = [item.get("name", "") for item in processed_data]
-        usecase = [item["use_cases"] for item in processed_data]
-        embeddings = self.sbert_model.encode(texts)
+        model_ids = [item["_id"] for item in batch_data]
+        names = [item.get("name", "") for item in batch_data]
+        usecase = [item["use_cases"] for item in batch_data]
+        if logger.isEnabledFor(logging.DEBUG):
+            # Padding cost grows with the spread; the encoder length-sorts each call
+            lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+            logger.debug(
+                "Encoding %s texts, length min/median/p95/max: %s",
+                len(texts),
+                np.percentile(lengths, [0, 50, 95, 100]).astype(int).tolist(),
+            )
+        # One call for the whole page, in page order: no manual sorting
+        embeddings = await loop.run_in_executor(
+            None, self.sbert_model.encode, texts, min(1024, len(texts))
+        )
 
         # Prepare documents for vector store
-        vector_docs = [
+        return [
             {"model_id": model_id, "name": name, "use_cases": usecase, "text": text, "embedding": embedding}
             for model_id, name, usecase, text, embedding in zip(model_ids, names, usecase, texts, embeddings)
         ]
 
-        # Store in vector database
-        self.vector_store.insert_vectors(vector_docs)
-
-        return len(vector_docs)
-
-    def run(
+    async def run(
         self,
         collection_name: str,
-        page_size: Optional[int] = None,
-        start_page: Optional[int] = None,
-        end_page: Optional[int] = None,
+        page_size: int,
+        last_id: Optional[Any] = None,
+        max_pages: Optional[int] = None,
     ):
         """
-        Runs the batch ingestion pipeline with pagination support.
+        Runs the batch ingestion pipeline with range pagination on _id.
+
+        Reading, embedding and writing run as three concurrent stages joined
+        by queues of at most two pages, so the next page loads and the
+        previous one is written while the current one is encoded.
 
         Args:
             page_size: Number of documents to process in each batch
-            start_page: Optional starting page number (1-based indexing)
-            end_page: Optional ending page number (inclusive)
+            last_id: Optional _id to resume after (exclusive)
+            max_pages: Optional maximum number of pages to process
         """
         try:
             self.source_collection = collection_name
+            # Idempotent: a no-op unless the vector index is missing or outdated.
+            # Writing vectors does not depend on it, so a failure only warns.
+            try:
+                await self.vector_store.ensure_vector_index(
+                    self.sbert_model.embedding_dimension
+                )
+            except Exception as e:
+                logger.warning("Vector index not ensured before ingestion: %s", e)
+
             # Get total document count
-            total_docs = self.source_db.count_documents(self.source_collection)
+            total_docs = await self.source_db.count_documents(self.source_collection)
             total_pages = math.ceil(total_docs / page_size)
 
-            # Validate and adjust page ranges
-            current_page = max(1, start_page if start_page else 1)
-            end_page = min(total_pages, end_page if end_page else total_pages)
-
             logger.info(
-                f"Starting batch ingestion: {total_docs} documents, {total_pages} total pages"
+                "Starting batch ingestion: %s documents, %s total pages",
+                total_docs,
+                total_pages,
             )
             logger.info(
-                f"Processing pages {current_page} to {end_page} with batch size {page_size}"
+                "Processing documents after %s with batch size %s",
+                last_id,
+                page_size,
             )
 
-            total_processed = 0
-
-            # Process each batch
-            while current_page <= end_page:
+            pages: asyncio.Queue = asyncio.Queue(maxsize=2)
+            writes: asyncio.Queue = asyncio.Queue(maxsize=2)
+            # Only advanced once a page is written, so last_id is safe to resume from
+            progress = {"total_processed": 0, "pages_processed": 0, "last_id": last_id}
+
+            async def read_pages():
+                if max_pages == 0:
+                    await pages.put(None)
+                    return
+
+                pages_read = 0
+                # One sorted cursor for the whole run, resumed after last_id
+                batches = self.source_db.iter_collection(
+                    self.source_collection, page_size, last_id=last_id
+                )
                 try:
-                    logger.info(f"Processing page {current_page}/{end_page}")
-
-                    # Load batch data from MongoDB
-                    batch_data = self.source_db.load_collection_with_pagination(
-                        self.source_collection,
-                        page=current_page,
-                        page_size=page_size,
-                    )
-
-                    if not batch_data:
+                    async for batch_data in batches:
+                        await pages.put(batch_data)
+                        pages_read += 1
+                        logger.info(
+                            "Loaded page %s up to %s", pages_read, batch_data[-1]["_id"]
+                        )
+                        if max_pages is not None and pages_read >= max_pages:
+                            break
+                    else:
                         logger.info("No more documents to process")
+                finally:
+                    # Closes the cursor when stopping early
+                    await batches.aclose()
+                await pages.put(None)
+
+            async def embed_pages():
+                while True:
+                    batch_data = await pages.get()
+                    if batch_data is None:
+                        break
+                    try:
+                        vector_docs = await self._embed_batch(batch_data)
+                    except Exception as batch_error:
+                        logger.error(
+                            "Error processing batch after %s: %s",
+                            progress["last_id"],
+                            batch_error,
+                        )
+                        raise
+                    await writes.put((vector_docs, batch_data[-1]["_id"]))
+                await writes.put(None)
+
+            async def write_pages():
+                while True:
+                    item = await writes.get()
+                    if item is None:
                         break
+                    vector_docs, page_last_id = item
 
-                    # Process the batch
-                    processed_count = self._process_batch(batch_data)
-                    total_processed += processed_count
+                    # Acknowledged writes, so last_id never runs ahead of stored pages
+                    await self.vector_store.insert_vectors(vector_docs)
+                    progress["total_processed"] += len(vector_docs)
+                    progress["pages_processed"] += 1
+                    progress["last_id"] = page_last_id
 
                     logger.info(
-                        f"Successfully processed {processed_count} documents in page {current_page}"
+                        "Successfully processed %s documents up to %s",
+                        len(vector_docs),
+                        page_last_id,
                     )
-                    current_page += 1
 
-                except Exception as batch_error:
-                    logger.error(
-                        f"Error processing batch on page {current_page}: {batch_error}"
-                    )
-                    raise
+            # The first failing stage cancels the others and is re-raised
+            stages = [
+                asyncio.ensure_future(stage())
+                for stage in (read_pages, embed_pages, write_pages)
+            ]
+            try:
+                await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+            finally:
+                for stage in stages:
+                    stage.cancel()
+                # Wait for cancelled stages to clean up (the reader closes its cursor)
+                outcomes = await asyncio.gather(*stages, return_exceptions=True)
+            for outcome in outcomes:
+                # Cancellations are BaseExceptions and skipped here
+                if isinstance(outcome, Exception):
+                    raise outcome
 
             logger.info(
-                f"Batch ingestion completed. Total documents processed: {total_processed}"
+                "Batch ingestion completed. Total documents processed: %s",
+                progress["total_processed"],
             )
 
             return {
                 "status": "success",
-                "total_processed": total_processed,
-                "pages_processed": current_page - start_page,
+                "total_processed": progress["total_processed"],
+                "pages_processed": progress["pages_processed"],
                 "total_pages": total_pages,
+                "last_id": progress["last_id"],
             }
 
         except Exception as e:
-            logger.error(f"Error in batch ingestion pipeline: {e}")
+            logger.error("Error in batch ingestion pipeline: %s", e)
             raise
 
-    def get_embedding(self, data: dict):
-        return self._single_process(data)
+    def get_embeddings(self, data: List[dict]):
+        return self._embed_documents(data)
 
-    def get_progress(self):
+    async def get_progress(self):
         """
         Get the current progress of document processing.
 
@@ -163,8 +290,8 @@ class IngestionPipeline:
             dict: Progress information including total documents and processed count
         """
         try:
-            total_docs = self.source_db.count_documents(self.source_collection)
-            processed_docs = self.vector_store.count_documents()
+            total_docs = await self.source_db.count_documents(self.source_collection)
+            processed_docs = await self.vector_store.count_documents()
 
             return {
                 "total_documents": total_docs,
@@ -175,5 +302,5 @@ class IngestionPipeline:
                 ),
             }
         except Exception as e:
-            logger.error(f"Error getting progress: {e}")
+            logger.error("Error getting progress: %s", e)
             raise
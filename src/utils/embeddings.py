@@ -0,0 +1,61 @@
+from typing import List, Sequence, Union
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype, VECTOR_SUBTYPE
+
+# BSON vector header: dtype byte followed by the padding byte
+_FLOAT32_HEADER = BinaryVectorDtype.FLOAT32.value + b"\x00"
+_INT8_HEADER = BinaryVectorDtype.INT8.value + b"\x00"
+
+
+def to_bson_vector(embedding: Union[Sequence[float], np.ndarray]) -> Binary:
+    """
+    Pack an embedding as a BSON vector, as indexed by $vectorSearch.
+
+    int8 arrays (see src.utils.quantize) are packed as int8 vectors, anything
+    else as float32.
+    """
+    vector = np.asarray(embedding)
+    if vector.dtype == np.int8:
+        return Binary(_INT8_HEADER + vector.tobytes(), VECTOR_SUBTYPE)
+    return Binary(_FLOAT32_HEADER + vector.astype("<f4").tobytes(), VECTOR_SUBTYPE)
+
+
+def to_bson_vectors(embeddings: np.ndarray) -> List[Binary]:
+    """Pack each row of a matrix as a BSON vector, converting the whole batch at once."""
+    matrix = np.asarray(embeddings)
+    if matrix.dtype == np.int8:
+        header = _INT8_HEADER
+    else:
+        header, matrix = _FLOAT32_HEADER, matrix.astype("<f4", copy=False)
+    if not matrix.size:
+        return []
+    data = matrix.tobytes()
+    row_size = matrix.shape[-1] * matrix.itemsize
+    return [
+        Binary(header + data[start : start + row_size], VECTOR_SUBTYPE)
+        for start in range(0, len(data), row_size)
+    ]
+
+
+def to_bson_bits(embedding: Union[Sequence[float], np.ndarray]) -> Binary:
+    """Pack the signs of an embedding as a BSON packed-bit vector (one bit per dimension)."""
+    vector = np.asarray(embedding)
+    # The padding byte counts the unused low bits of the last byte
+    header = BinaryVectorDtype.PACKED_BIT.value + bytes([-vector.shape[-1] % 8])
+    return Binary(header + np.packbits(vector > 0).tobytes(), VECTOR_SUBTYPE)
+
+
+def from_bson_vector(value: Union[Binary, Sequence[float]]) -> np.ndarray:
+    """Unpack a stored embedding, accepting BSON vectors and legacy arrays."""
+    if isinstance(value, Binary) and value.subtype == VECTOR_SUBTYPE:
+        if value[:1] == BinaryVectorDtype.INT8.value:
+            return np.frombuffer(value, dtype=np.int8, offset=len(_INT8_HEADER))
+        return np.frombuffer(value, dtype="<f4", offset=len(_FLOAT32_HEADER))
+    return np.asarray(value, dtype=np.float32)
+
+
+def normalize(embeddings: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+    """Scale embeddings (a vector or rows of a matrix) to unit length."""
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
@@ -0,0 +1,26 @@
+from typing import Sequence, Union
+import numpy as np
+
+
+def calibrate_int8(embeddings: Union[Sequence[Sequence[float]], np.ndarray]) -> float:
+    """Pick the int8 scale for a sample of embeddings: their largest magnitude."""
+    magnitude = float(np.abs(np.asarray(embeddings, dtype=np.float32)).max())
+    return magnitude if magnitude > 0 else 1.0
+
+
+def quantize_int8(
+    embeddings: Union[Sequence[float], np.ndarray], scale: float
+) -> np.ndarray:
+    """
+    Map embeddings onto [-127, 127] with one symmetric scale.
+
+    A shared scale and no zero point keep int8 dot products proportional to
+    the float ones, so an index can rank the quantized vectors directly.
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    return np.clip(np.rint(vectors * (127 / scale)), -127, 127).astype(np.int8)
+
+
+def dequantize_int8(quantized: np.ndarray, scale: float) -> np.ndarray:
+    """Map int8 embeddings back to approximate float32 values."""
+    return quantized.astype(np.float32) * (scale / 127)
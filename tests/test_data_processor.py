@@ -0,0 +1,57 @@
+from src.utils.data_processor import MAX_CONTENT_LENGTH, model_to_text, models_to_text
+
+# Produced by the original models_to_text, before it was split into
+# module-level helpers; embeddings already stored depend on these strings
+# staying byte-for-byte identical.
+GOLDEN = [
+    (
+        {
+            "name": "bert_base_uncased",
+            "framework": "PyTorch",
+            "task": ["text_classification", "question answering"],
+            "architecture": "Transformer",
+            "license": "Apache-2.0",
+            "popularity": {
+                "stars": {"$numberInt": "1200"},
+                "downloads": {"$numberDouble": "3.5e6"},
+            },
+            "performance": {"accuracy": {"$numberDouble": "0.91"}, "f1": 0.88},
+            "hardware_requirements": {"gpu": True, "min_ram_gb": {"$numberInt": "8"}},
+            "model_size_parameters": {"$numberInt": "110000000"},
+        },
+        "Name: bert base uncased.. Framework: pytorch.. Task: text classification.. "
+        "Question answering.. Architecture: transformer.. License: apache-2.. 0.. "
+        "Popularity: stars: 1200.. Downloads: 3.. 5e6.. Performance: accuracy: 0.. "
+        "91.. F1: 0.. 88.. Hardware requirements: gpu: true.. Min ram gb: 8.. "
+        "Model size parameters: 110000000",
+    ),
+    (
+        {
+            "name": "resnet50",
+            "description": "Deep residual network: image classification , 50 layers.  "
+            "trained on ImageNet",
+            "metadata": {"source": "torchvision", "tags": ["vision", "cnn"]},
+            "domains": [],
+            "empty": None,
+        },
+        "Name: resnet50.. Description: deep residual network: image classification.. "
+        "50 layers.. Trained on imagenet.. Metadata: 'source': 'torchvision'.. "
+        "'tags': 'vision'.. 'cnn'.. Domains:.. Empty: none",
+    ),
+]
+
+
+def test_model_to_text_matches_golden_output():
+    for document, expected in GOLDEN:
+        assert model_to_text(document) == expected
+
+
+def test_models_to_text_sets_content():
+    documents = [dict(document) for document, _ in GOLDEN]
+    processed = models_to_text(documents)
+    assert [item["content"] for item in processed] == [text for _, text in GOLDEN]
+
+
+def test_model_to_text_is_capped():
+    text = model_to_text({"description": "word " * 1000})
+    assert len(text) == MAX_CONTENT_LENGTH
@@ -0,0 +1,66 @@
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+from src.utils.embeddings import (
+    from_bson_vector,
+    normalize,
+    to_bson_bits,
+    to_bson_vector,
+    to_bson_vectors,
+)
+
+
+def test_float32_vector_matches_pymongo():
+    vector = [0.5, -1.25, 3.0]
+    expected = Binary.from_vector(vector, BinaryVectorDtype.FLOAT32)
+    assert to_bson_vector(vector) == expected
+    assert to_bson_vector(np.array(vector, dtype=np.float64)) == expected
+
+
+def test_int8_vector_matches_pymongo():
+    vector = np.array([-127, 0, 5, 127], dtype=np.int8)
+    expected = Binary.from_vector(vector.tolist(), BinaryVectorDtype.INT8)
+    assert to_bson_vector(vector) == expected
+
+
+def test_to_bson_vectors_matches_rows():
+    matrix = np.random.default_rng(0).normal(size=(5, 7))
+    assert to_bson_vectors(matrix) == [to_bson_vector(row) for row in matrix]
+    quantized = np.arange(-6, 6, dtype=np.int8).reshape(3, 4)
+    assert to_bson_vectors(quantized) == [to_bson_vector(row) for row in quantized]
+    assert to_bson_vectors(np.empty((0, 4))) == []
+
+
+def test_to_bson_bits_matches_pymongo():
+    # 10 dimensions leave 6 padding bits in the second byte
+    vector = np.array([1, -1, 2, 0, -3, 4, 5, -6, 7, -8], dtype=np.float32)
+    packed = np.packbits(vector > 0).tolist()
+    expected = Binary.from_vector(packed, BinaryVectorDtype.PACKED_BIT, padding=6)
+    assert to_bson_bits(vector) == expected
+    assert to_bson_bits(vector[:8]) == Binary.from_vector(
+        packed[:1], BinaryVectorDtype.PACKED_BIT
+    )
+
+
+def test_from_bson_vector_round_trips():
+    vector = np.array([0.5, -1.25, 3.0], dtype=np.float32)
+    decoded = from_bson_vector(to_bson_vector(vector))
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, vector)
+
+    quantized = np.array([-127, 3, 127], dtype=np.int8)
+    decoded = from_bson_vector(to_bson_vector(quantized))
+    assert decoded.dtype == np.int8
+    np.testing.assert_array_equal(decoded, quantized)
+
+
+def test_from_bson_vector_accepts_legacy_arrays():
+    decoded = from_bson_vector([0.5, 1.5])
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, [0.5, 1.5])
+
+
+def test_normalize():
+    np.testing.assert_allclose(normalize([3.0, 4.0]), [0.6, 0.8])
+    # Rows are scaled independently and zero rows are left alone
+    rows = normalize([[3.0, 4.0], [0.0, 0.0]])
+    np.testing.assert_allclose(rows, [[0.6, 0.8], [0.0, 0.0]])
@@ -0,0 +1,89 @@
+import asyncio
+import numpy as np
+from src.inference.gpu_worker import batch_encoder
+
+
+class FakeModel:
+    """Encodes a text as a vector filled with its length, recording each call."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def _embed(self, text):
+        return np.full(3, len(text), dtype=np.float32)
+
+    def encode_one(self, text):
+        self.calls.append([text])
+        if self.fail:
+            raise RuntimeError("encoder failed")
+        return self._embed(text)
+
+    def encode(self, texts, batch_size):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("encoder failed")
+        return np.stack([self._embed(text) for text in texts])
+
+
+def encode_all(model, texts, **kwargs):
+    async def run():
+        async with batch_encoder(model, **kwargs) as encoder:
+            return await asyncio.gather(*(encoder.submit(text) for text in texts))
+
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_share_a_forward_pass():
+    model = FakeModel()
+    embeddings = encode_all(model, ["a", "bb", "ccc"])
+    assert model.calls == [["a", "bb", "ccc"]]
+    assert [embedding[0] for embedding in embeddings] == [1, 2, 3]
+
+
+def test_batches_are_capped():
+    model = FakeModel()
+    texts = [str(number) for number in range(5)]
+    encode_all(model, texts, max_batch_size=2)
+    assert [len(call) for call in model.calls] == [2, 2, 1]
+
+
+def test_errors_reach_every_caller_and_the_loop_survives():
+    model = FakeModel(fail=True)
+
+    async def run():
+        async with batch_encoder(model) as encoder:
+            outcomes = await asyncio.gather(
+                encoder.submit("a"), encoder.submit("b"), return_exceptions=True
+            )
+            model.fail = False
+            return outcomes, await encoder.submit("c")
+
+    outcomes, embedding = asyncio.run(run())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert embedding[0] == 1
+
+
+def test_repeated_texts_are_encoded_once():
+    model = FakeModel()
+    embeddings = encode_all(model, ["a", "bb", "a", "ccc", "bb"])
+    assert model.calls == [["a", "bb", "ccc"]]
+    assert [embedding[0] for embedding in embeddings] == [1, 2, 1, 3, 2]
+
+
+def test_cached_texts_skip_the_encoder():
+    model = FakeModel()
+
+    async def run():
+        async with batch_encoder(model) as encoder:
+            await asyncio.gather(encoder.submit("a"), encoder.submit("bb"))
+            # Only the miss is encoded, on the single-text path
+            await asyncio.gather(encoder.submit("a"), encoder.submit("dddd"))
+            cached = await encoder.submit("bb")
+            encoder.clear_cache()
+            await encoder.submit("a")
+            return cached
+
+    cached = asyncio.run(run())
+    assert model.calls == [["a", "bb"], ["dddd"], ["a"]]
+    assert not cached.flags.writeable
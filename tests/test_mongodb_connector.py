@@ -0,0 +1,72 @@
+import asyncio
+from src.database.mongodb_connector import MongoDBConnector
+from src.utils.data_processor import model_to_text
+from src.utils.embeddings import to_bson_bits, to_bson_vector
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, *args):
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    async def to_list(self, length=None):
+        documents, self.documents = self.documents[:length], self.documents[length:]
+        return documents
+
+    async def close(self):
+        pass
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, filter, projection):
+        return FakeCursor(
+            [
+                {key: value for key, value in document.items() if key not in projection}
+                for document in self.documents
+            ]
+        )
+
+
+def make_connector(documents):
+    # Skips connect(): the connector only needs a database to read from
+    connector = MongoDBConnector.__new__(MongoDBConnector)
+    connector.database = {"models": FakeCollection(documents)}
+    return connector
+
+
+DOCUMENT = {
+    "_id": 1,
+    "name": "resnet50",
+    "embedding": to_bson_vector([0.6, -0.8]),
+    "embedding_bin": to_bson_bits([0.6, -0.8]),
+}
+
+
+def test_reads_skip_stored_vectors():
+    connector = make_connector([DOCUMENT])
+    model = asyncio.run(connector.get_model("models", {}))
+    assert model == {"_id": 1, "name": "resnet50"}
+
+
+def test_iter_collection_text_ignores_stored_vectors():
+    connector = make_connector([DOCUMENT])
+
+    async def read():
+        return [page async for page in connector.iter_collection("models", 10)]
+
+    (page,) = asyncio.run(read())
+    assert model_to_text(page[0]) == "Id: 1.. Name: resnet50"
+
+
+def test_empty_projection_returns_full_documents():
+    connector = make_connector([DOCUMENT])
+    model = asyncio.run(connector.get_model("models", {}, projection={}))
+    assert model == DOCUMENT
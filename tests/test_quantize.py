@@ -0,0 +1,35 @@
+import numpy as np
+from src.utils.embeddings import normalize
+from src.utils.quantize import calibrate_int8, dequantize_int8, quantize_int8
+
+
+def test_round_trip_error_is_within_half_a_step():
+    embeddings = normalize(np.random.default_rng(0).normal(size=(32, 64)))
+    scale = calibrate_int8(embeddings)
+    quantized = quantize_int8(embeddings, scale)
+    assert quantized.dtype == np.int8
+    error = np.abs(dequantize_int8(quantized, scale) - embeddings).max()
+    assert error <= scale / 127 / 2 + 1e-6
+
+
+def test_clips_values_beyond_the_scale():
+    quantized = quantize_int8([-3.0, -1.0, 0.0, 1.0, 3.0], scale=1.0)
+    assert quantized.tolist() == [-127, -127, 0, 127, 127]
+
+
+def test_calibrate_handles_zero_vectors():
+    assert calibrate_int8([[0.0, 0.0]]) == 1.0
+    assert calibrate_int8([[0.5, -2.0]]) == 2.0
+
+
+def test_int8_dot_products_preserve_ranking():
+    rng = np.random.default_rng(1)
+    documents = normalize(rng.normal(size=(100, 64)))
+    query = normalize(rng.normal(size=64))
+    scale = calibrate_int8(documents)
+    exact = documents @ query
+    approximate = quantize_int8(documents, scale).astype(np.int32) @ quantize_int8(
+        query, scale
+    ).astype(np.int32)
+    assert np.corrcoef(exact, approximate)[0, 1] > 0.99
+    assert np.argmax(approximate) == np.argmax(exact)
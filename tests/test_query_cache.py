@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from src.cache.query_cache import MAX_CACHED_QUERY_LENGTH, QueryCache
+
+
+def test_put_and_get():
+    cache = QueryCache(capacity=2)
+    stored = cache.put("query", [1.0, 2.0])
+    assert stored.dtype == np.float32
+    np.testing.assert_array_equal(cache.get("query"), [1.0, 2.0])
+    assert cache.get("other") is None
+
+
+def test_cached_embeddings_are_read_only():
+    cache = QueryCache()
+    cache.put("query", np.ones(2))
+    with pytest.raises(ValueError):
+        cache.get("query")[0] = 0
+
+
+def test_evicts_least_recently_used():
+    cache = QueryCache(capacity=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")
+    cache.put("c", [3.0])
+    assert len(cache) == 2
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+
+
+def test_skips_long_queries_and_clears():
+    cache = QueryCache()
+    cache.put("x" * (MAX_CACHED_QUERY_LENGTH + 1), [1.0])
+    assert len(cache) == 0
+    cache.put("a", [1.0])
+    cache.clear()
+    assert cache.get("a") is None
@@ -0,0 +1,112 @@
+import asyncio
+import numpy as np
+import pytest
+
+# The pipeline module loads the SBERT model class, which needs torch
+pytest.importorskip("sentence_transformers")
+
+from src.pipelines.ingestion_pipeline import IngestionPipeline  # noqa: E402
+
+
+class FakeSourceDB:
+    def __init__(self, count):
+        self.documents = [
+            {"_id": index, "name": f"model{index}", "use_cases": ["search"]}
+            for index in range(count)
+        ]
+        self.closed = False
+
+    async def count_documents(self, collection_name):
+        return len(self.documents)
+
+    async def iter_collection(self, collection_name, batch_size, last_id=None):
+        documents = [
+            document
+            for document in self.documents
+            if last_id is None or document["_id"] > last_id
+        ]
+        try:
+            for start in range(0, len(documents), batch_size):
+                yield [dict(document) for document in documents[start : start + batch_size]]
+        finally:
+            self.closed = True
+
+
+class FakeVectorStore:
+    def __init__(self, fail_on_page=None, index_error=False):
+        self.pages = []
+        self.fail_on_page = fail_on_page
+        self.index_error = index_error
+
+    async def ensure_vector_index(self, num_dimensions):
+        if self.index_error:
+            raise RuntimeError("no search index privileges")
+
+    async def insert_vectors(self, vectors):
+        if len(self.pages) == self.fail_on_page:
+            raise RuntimeError("write failed")
+        self.pages.append(vectors)
+
+
+class FakeModel:
+    embedding_dimension = 3
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def encode(self, texts, batch_size=1024):
+        if self.fail:
+            raise RuntimeError("encode failed")
+        return np.ones((len(texts), self.embedding_dimension), dtype=np.float32)
+
+
+def run(source_db, vector_store, model=None, **kwargs):
+    pipeline = IngestionPipeline(source_db, vector_store, model or FakeModel())
+    return asyncio.run(pipeline.run("models", **kwargs))
+
+
+def test_writes_every_page_in_order():
+    vector_store = FakeVectorStore()
+    result = run(FakeSourceDB(25), vector_store, page_size=10)
+    assert result == {
+        "status": "success",
+        "total_processed": 25,
+        "pages_processed": 3,
+        "total_pages": 3,
+        "last_id": 24,
+    }
+    assert [len(page) for page in vector_store.pages] == [10, 10, 5]
+    assert [document["model_id"] for page in vector_store.pages for document in page] == list(
+        range(25)
+    )
+
+
+def test_resumes_after_last_id_and_stops_at_max_pages():
+    source_db = FakeSourceDB(25)
+    vector_store = FakeVectorStore()
+    result = run(source_db, vector_store, page_size=5, last_id=9, max_pages=2)
+    assert result["last_id"] == 19
+    assert vector_store.pages[0][0]["model_id"] == 10
+    assert source_db.closed
+
+
+def test_write_failure_is_raised_and_closes_the_cursor():
+    source_db = FakeSourceDB(50)
+    vector_store = FakeVectorStore(fail_on_page=1)
+    with pytest.raises(RuntimeError, match="write failed"):
+        run(source_db, vector_store, page_size=10)
+    assert len(vector_store.pages) == 1
+    assert source_db.closed
+
+
+def test_encode_failure_is_raised():
+    vector_store = FakeVectorStore()
+    with pytest.raises(RuntimeError, match="encode failed"):
+        run(FakeSourceDB(25), vector_store, FakeModel(fail=True), page_size=10)
+    assert vector_store.pages == []
+
+
+def test_index_errors_do_not_stop_ingestion():
+    vector_store = FakeVectorStore(index_error=True)
+    result = run(FakeSourceDB(5), vector_store, page_size=10)
+    assert result["total_processed"] == 5
@@ -0,0 +1,51 @@
+import numpy as np
+from src.cache.sim_lru import SimLRU
+
+
+def test_exact_and_near_hits():
+    cache = SimLRU(capacity=4, epsilon=0.02)
+    cache.put([1.0, 0.0, 0.0], "x")
+    assert cache.get([1.0, 0.0, 0.0]) == "x"
+    # Lookups are scale-invariant and tolerate a small angle
+    assert cache.get([2.0, 0.0, 0.0]) == "x"
+    assert cache.get([1.0, 0.1, 0.0]) == "x"
+
+
+def test_miss_beyond_epsilon():
+    cache = SimLRU(capacity=4, epsilon=0.02)
+    assert cache.get([1.0, 0.0]) is None
+    cache.put([1.0, 0.0], "x")
+    assert cache.get([1.0, 1.0]) is None
+    assert cache.get([0.0, 1.0]) is None
+
+
+def test_evicts_least_recently_used():
+    cache = SimLRU(capacity=2, epsilon=0.0)
+    cache.put([1.0, 0.0, 0.0], "a")
+    cache.put([0.0, 1.0, 0.0], "b")
+    cache.get([1.0, 0.0, 0.0])
+    cache.put([0.0, 0.0, 1.0], "c")
+    assert len(cache) == 2
+    assert cache.get([1.0, 0.0, 0.0]) == "a"
+    assert cache.get([0.0, 1.0, 0.0]) is None
+    assert cache.get([0.0, 0.0, 1.0]) == "c"
+
+
+def test_put_replaces_value():
+    cache = SimLRU(capacity=2)
+    cache.put(np.array([1.0, 0.0]), "a")
+    cache.put(np.array([1.0, 0.0]), "b")
+    assert len(cache) == 1
+    assert cache.get([1.0, 0.0]) == "b"
+
+
+def test_clear_and_zero_capacity():
+    cache = SimLRU(capacity=2)
+    cache.put([1.0, 0.0], "a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get([1.0, 0.0]) is None
+
+    disabled = SimLRU(capacity=0)
+    disabled.put([1.0, 0.0], "a")
+    assert disabled.get([1.0, 0.0]) is None
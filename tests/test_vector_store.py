@@ -0,0 +1,302 @@
+import asyncio
+import numpy as np
+import pytest
+from pymongo.errors import OperationFailure
+from src.database import vector_store as vector_store_module
+from src.database.vector_store import MongoDBVectorStore
+from src.utils.embeddings import normalize, to_bson_vector
+from src.utils.quantize import quantize_int8
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    """Runs the handful of aggregation stages the store emits over fixed documents."""
+
+    def __init__(self, name, documents):
+        self.name = name
+        self.documents = documents
+        self.pipelines = []
+        self.search_indexes = []
+        self.index_updates = []
+
+    def list_search_indexes(self, name):
+        return FakeCursor([index for index in self.search_indexes if index["name"] == name])
+
+    async def create_search_index(self, model):
+        self.search_indexes.append(
+            {"name": model.document["name"], "latestDefinition": model.document["definition"]}
+        )
+
+    async def update_search_index(self, name, definition):
+        self.index_updates.append(definition)
+
+    async def find_one(self, filter):
+        for document in self.documents:
+            if document["_id"] == filter["_id"]:
+                return document
+        return None
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self._run(pipeline))
+
+    def _run(self, pipeline):
+        documents = []
+        for stage in pipeline:
+            if "$vectorSearch" in stage:
+                documents = [dict(document) for document in self.documents]
+                documents = documents[: stage["$vectorSearch"]["limit"]]
+            elif "$project" in stage:
+                for document in documents:
+                    for key in stage["$project"]:
+                        document.pop(key, None)
+            elif "$addFields" in stage:
+                for document in documents:
+                    for key, value in stage["$addFields"].items():
+                        document[key] = str(document[key]) if key == "_id" else value
+            elif "$unionWith" in stage:
+                documents = documents + self._run(stage["$unionWith"]["pipeline"])
+        return documents
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection(name, [])
+        return self[name]
+
+
+def make_documents(count, dimensions=4):
+    rng = np.random.default_rng(0)
+    return [
+        {"_id": index, "name": f"model{index}", "embedding": to_bson_vector(vector)}
+        for index, vector in enumerate(normalize(rng.normal(size=(count, dimensions))))
+    ]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    database["vectors"] = FakeCollection("vectors", make_documents(30))
+    database["models"] = FakeCollection("models", make_documents(30))
+    client = {"test": database}
+    monkeypatch.setattr(vector_store_module, "get_client", lambda uri: client)
+    return database
+
+
+@pytest.fixture
+def store(database):
+    return MongoDBVectorStore("password", "test", "vectors")
+
+
+QUERY = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+
+
+def search(store, top_k, **kwargs):
+    return asyncio.run(store.find_similar_vectors(QUERY, top_k, **kwargs))
+
+
+def test_cached_results_serve_smaller_top_k(store, database):
+    ten = search(store, 10)
+    five = search(store, 5)
+    assert len(database["vectors"].pipelines) == 1
+    assert five == ten[:5]
+
+
+def test_larger_top_k_searches_again_and_replaces_entry(store, database):
+    search(store, 5)
+    assert len(search(store, 10)) == 10
+    assert len(search(store, 8)) == 8
+    assert len(database["vectors"].pipelines) == 2
+
+
+def test_one_cache_per_collection(store):
+    search(store, 3)
+    search(store, 7, include_embedding=True)
+    search(store, 4, collection_name="models")
+    assert sorted(store._caches) == ["models", "vectors"]
+
+
+def test_embeddings_are_stripped_or_fetched_as_requested(store, database):
+    search(store, 5)
+    with_embedding = search(store, 5, include_embedding=True)
+    assert len(database["vectors"].pipelines) == 2
+    assert all(isinstance(document["embedding"], np.ndarray) for document in with_embedding)
+
+    without_embedding = search(store, 3)
+    assert len(database["vectors"].pipelines) == 2
+    assert all("embedding" not in document for document in without_embedding)
+    # Stripping copies documents instead of changing the cached ones
+    assert "embedding" in search(store, 5, include_embedding=True)[0]
+
+
+def test_stream_and_batch_share_the_cache(store, database):
+    async def stream(top_k):
+        return [document async for document in store.stream_similar_vectors(QUERY, top_k)]
+
+    streamed = asyncio.run(stream(6))
+    batch = asyncio.run(store.find_similar_vectors_batch(np.stack([QUERY]), 4))
+    assert batch == [streamed[:4]]
+    assert len(database["vectors"].pipelines) == 1
+
+
+def test_clear_cache(store, database):
+    search(store, 5)
+    store.clear_cache()
+    search(store, 5)
+    assert len(database["vectors"].pipelines) == 2
+
+
+def test_search_pipeline_shapes_results_on_the_server():
+    query = to_bson_vector(QUERY)
+    pipeline = MongoDBVectorStore._vector_search_pipeline(query, 5)
+    assert pipeline == [
+        {
+            "$vectorSearch": {
+                "queryVector": query,
+                "path": "embedding",
+                "numCandidates": 50,
+                "limit": 5,
+                "index": "vector_index",
+            }
+        },
+        {"$project": {"embedding_bin": 0, "embedding": 0}},
+        {"$addFields": {"_id": {"$toString": "$_id"}}},
+    ]
+    assert MongoDBVectorStore._vector_search_pipeline(query, 5, True)[1] == {
+        "$project": {"embedding_bin": 0}
+    }
+    # numCandidates is capped at Atlas' limit
+    stage = MongoDBVectorStore._vector_search_stage(query, 5000)
+    assert stage["$vectorSearch"]["numCandidates"] == 10_000
+
+
+def test_batch_search_is_one_union_pipeline(store, database):
+    queries = np.eye(4, dtype=np.float32)[:3]
+    results = asyncio.run(store.find_similar_vectors_batch(queries, 2))
+
+    (pipeline,) = database["vectors"].pipelines
+    assert pipeline[0]["$vectorSearch"]["limit"] == 2
+    assert pipeline[3] == {"$addFields": {"_query_index": 0}}
+    unions = [stage["$unionWith"] for stage in pipeline[4:]]
+    assert [union["coll"] for union in unions] == ["vectors", "vectors"]
+    assert [union["pipeline"][-1] for union in unions] == [
+        {"$addFields": {"_query_index": 1}},
+        {"$addFields": {"_query_index": 2}},
+    ]
+    # Results are split on the query index, which is not returned
+    assert [len(result) for result in results] == [2, 2, 2]
+    assert all("_query_index" not in document for result in results for document in result)
+
+
+def test_batch_search_falls_back_without_union_support(store, database):
+    collection = database["vectors"]
+    aggregate = collection.aggregate
+
+    def reject_union(pipeline):
+        if any("$unionWith" in stage for stage in pipeline):
+            raise OperationFailure("$vectorSearch is not allowed in $unionWith")
+        return aggregate(pipeline)
+
+    collection.aggregate = reject_union
+    queries = np.eye(4, dtype=np.float32)[:3]
+    results = asyncio.run(store.find_similar_vectors_batch(queries, 2))
+    assert [len(result) for result in results] == [2, 2, 2]
+    assert len(collection.pipelines) == 3
+
+
+def test_binary_search_rescores_candidates_by_int8_dot_product(database):
+    vectors = normalize(np.random.default_rng(1).normal(size=(30, 4)))
+    database["vectors"] = FakeCollection(
+        "vectors",
+        [
+            {"_id": index, "embedding": to_bson_vector(quantize_int8(vector, 1.0))}
+            for index, vector in enumerate(vectors)
+        ],
+    )
+    database["vector_quantization"] = FakeCollection(
+        "vector_quantization", [{"_id": "vectors", "scale": 1.0}]
+    )
+    store = MongoDBVectorStore("password", "test", "vectors", quantization="binary")
+
+    results = search(store, 3, include_embedding=True)
+    (pipeline,) = database["vectors"].pipelines
+    assert pipeline[0]["$vectorSearch"]["path"] == "embedding_bin"
+    assert pipeline[0]["$vectorSearch"]["limit"] == 3 * vector_store_module.RESCORE_FACTOR
+    assert [document["_id"] for document in results] == [
+        str(index) for index in np.argsort(-(vectors @ QUERY), kind="stable")[:3]
+    ]
+    np.testing.assert_allclose(
+        results[0]["embedding"], vectors[int(results[0]["_id"])], atol=1 / 127
+    )
+
+
+DEFINITION = {
+    "fields": [
+        {
+            "type": "vector",
+            "path": "embedding",
+            "numDimensions": 4,
+            "similarity": "dotProduct",
+            "quantization": "scalar",
+        }
+    ]
+}
+
+
+def test_index_matches_ignores_keys_atlas_adds():
+    latest = {
+        "fields": [
+            {**DEFINITION["fields"][0], "hnswOptions": {"maxEdges": 16}},
+        ]
+    }
+    assert MongoDBVectorStore._index_matches(latest, DEFINITION)
+
+
+def test_index_matches_detects_changes():
+    assert not MongoDBVectorStore._index_matches(None, DEFINITION)
+    changed = {"fields": [{**DEFINITION["fields"][0], "numDimensions": 8}]}
+    assert not MongoDBVectorStore._index_matches(changed, DEFINITION)
+    missing = {"fields": [{**DEFINITION["fields"][0], "quantization": None}]}
+    assert not MongoDBVectorStore._index_matches(missing, DEFINITION)
+    extra = {"fields": DEFINITION["fields"] + [{"type": "vector", "path": "embedding_bin"}]}
+    assert not MongoDBVectorStore._index_matches(extra, DEFINITION)
+
+
+def test_ensure_vector_index_creates_then_leaves_matching_index(store, database):
+    collection = database["vectors"]
+    asyncio.run(store.ensure_vector_index(4))
+    assert collection.search_indexes == [
+        {"name": "vector_index", "latestDefinition": DEFINITION}
+    ]
+    asyncio.run(store.ensure_vector_index(4))
+    assert len(collection.search_indexes) == 1
+    assert collection.index_updates == []
+
+    asyncio.run(store.ensure_vector_index(8))
+    assert collection.index_updates[0]["fields"][0]["numDimensions"] == 8
+
+
+def test_binary_store_indexes_quantized_vectors_and_sign_bits(database):
+    store = MongoDBVectorStore("password", "test", "vectors", quantization="binary")
+    asyncio.run(store.ensure_vector_index(4, "models"))
+    (index,) = database["models"].search_indexes
+    fields = index["latestDefinition"]["fields"]
+    assert [(field["path"], field["similarity"]) for field in fields] == [
+        ("embedding", "dotProduct"),
+        ("embedding_bin", "euclidean"),
+    ]
+    assert fields[0]["quantization"] == "none"